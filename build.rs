@@ -1,5 +1,10 @@
 fn main() {
-    let mut res = winres::WindowsResource::new();
-    res.set_icon("Zeichner.ico");
-    res.compile().unwrap();
-}
\ No newline at end of file
+    // Windows-Ressourcen (Icon) nur auf Windows einbetten;
+    // auf anderen Plattformen würde winres den Build abbrechen
+    #[cfg(windows)]
+    {
+        let mut res = winres::WindowsResource::new();
+        res.set_icon("Zeichner.ico");
+        res.compile().unwrap();
+    }
+}
@@ -11,8 +11,8 @@ pub use types::{Point, Quadrilateral, CustomLine};
 pub use utils::{
     distance_um, 
     distance_f64,
-    calculate_interior_angle, 
+    calculate_interior_angle,
+    calculate_all_interior_angles,
     calculate_intersection_angle,
-    format_length_um,
     angle_between_vectors,
 };
\ No newline at end of file
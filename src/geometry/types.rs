@@ -3,7 +3,7 @@
 
 /// Punkt in 2D-Raum
 /// Koordinaten werden als f64 gespeichert (für trigonometrische Berechnungen nötig)
-#[derive(Clone, Debug)]
+#[derive(Clone, Copy, Debug)]
 pub struct Point {
     pub x: f64, // in µm (als Float für Trigonometrie)
     pub y: f64, // in µm (als Float für Trigonometrie)
@@ -101,16 +101,48 @@ impl Quadrilateral {
         um.map(Self::um_to_mm)
     }
 
+    /// Liefert die beiden Eckpunkte einer Seite (0=AB, 1=BC, 2=CD, 3=DA)
+    #[inline]
+    pub fn side_vertices(&self, side: usize) -> (&Point, &Point) {
+        match side {
+            0 => (&self.vertices[0], &self.vertices[1]),
+            1 => (&self.vertices[1], &self.vertices[2]),
+            2 => (&self.vertices[2], &self.vertices[3]),
+            _ => (&self.vertices[3], &self.vertices[0]),
+        }
+    }
+
     /// Berechnet die Länge einer Seite aus den Vertices (in µm)
     pub fn get_side_length_um(&self, side: usize) -> i64 {
         use crate::geometry::utils::distance_um;
-        match side {
-            0 => distance_um(&self.vertices[0], &self.vertices[1]),
-            1 => distance_um(&self.vertices[1], &self.vertices[2]),
-            2 => distance_um(&self.vertices[2], &self.vertices[3]),
-            3 => distance_um(&self.vertices[3], &self.vertices[0]),
-            _ => 0,
+        let (v1, v2) = self.side_vertices(side);
+        distance_um(v1, v2)
+    }
+
+    /// Berechnet alle vier Seitenlängen in einem Durchlauf (in µm)
+    pub fn all_side_lengths_um(&self) -> [i64; 4] {
+        use crate::geometry::utils::distance_um;
+        let mut lengths = [0_i64; 4];
+        for i in 0..4 {
+            lengths[i] = distance_um(&self.vertices[i], &self.vertices[(i + 1) % 4]);
+        }
+        lengths
+    }
+
+    /// Achsenparallele Bounding-Box der Vertices in einem Durchlauf
+    /// Liefert (min_x, min_y, max_x, max_y) in µm
+    pub fn bounds(&self) -> (f64, f64, f64, f64) {
+        let first = &self.vertices[0];
+        let (mut min_x, mut min_y, mut max_x, mut max_y) = (first.x, first.y, first.x, first.y);
+
+        for v in &self.vertices[1..] {
+            min_x = min_x.min(v.x);
+            min_y = min_y.min(v.y);
+            max_x = max_x.max(v.x);
+            max_y = max_y.max(v.y);
         }
+
+        (min_x, min_y, max_x, max_y)
     }
 
     /// Berechnet die Länge einer Seite in Millimetern
@@ -119,13 +151,7 @@ impl Quadrilateral {
     }
 
     pub fn get_point_on_side(&self, side: usize, ratio: f64) -> Point {
-        let (v1, v2) = match side {
-            0 => (&self.vertices[0], &self.vertices[1]),
-            1 => (&self.vertices[1], &self.vertices[2]),
-            2 => (&self.vertices[2], &self.vertices[3]),
-            3 => (&self.vertices[3], &self.vertices[0]),
-            _ => (&self.vertices[0], &self.vertices[1]),
-        };
+        let (v1, v2) = self.side_vertices(side);
 
         Point::new(
             v1.x + (v2.x - v1.x) * ratio,
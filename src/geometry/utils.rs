@@ -1,15 +1,11 @@
 // Hilfsfunktionen für geometrische Berechnungen
 
 use super::types::Point;
-use std::f64::consts::PI;
 
 /// Berechnet die Distanz zwischen zwei Punkten in Mikrometer (µm)
 /// Verwendet Float für Zwischenberechnungen, rundet Endergebnis
 pub fn distance_um(p1: &Point, p2: &Point) -> i64 {
-    let dx = p2.x - p1.x;
-    let dy = p2.y - p1.y;
-    let dist = (dx * dx + dy * dy).sqrt();
-    dist.round() as i64
+    distance_f64(p1, p2).round() as i64
 }
 
 /// Berechnet die Distanz zwischen zwei Punkten als Float (für Konstruktion)
@@ -29,34 +25,38 @@ pub fn calculate_interior_angle(prev: &Point, vertex: &Point, next: &Point) -> f
 
     let dot = v1_x * v2_x + v1_y * v2_y;
     let cross = v1_x * v2_y - v1_y * v2_x;
-    
-    let angle_rad = cross.atan2(dot);
-    let mut angle_deg = angle_rad.abs() * 180.0 / PI;
-    
-    if angle_deg > 180.0 {
-        angle_deg = 360.0 - angle_deg;
-    }
-    
-    angle_deg
+
+    // atan2 liefert [-180°, 180°], nach abs() also immer [0°, 180°] —
+    // eine weitere Normalisierung ist nicht nötig
+    cross.atan2(dot).abs().to_degrees()
 }
 
-/// Formatiert eine Länge in µm konsistent als cm oder m
-pub fn format_length_um(um: i64, use_cm: bool) -> String {
-    let mm = um as f64 / 1000.0;
-    
-    if use_cm {
-        format!("{:.2} cm", mm / 10.0)
-    } else if mm >= 10000.0 {
-        format!("{:.3} m", mm / 1000.0)
-    } else {
-        format!("{:.2} cm", mm / 10.0)
+/// Berechnet alle vier Innenwinkel eines Vierecks in einem Durchlauf
+/// Die Kantenvektoren werden nur einmal berechnet und für beide
+/// angrenzenden Winkel wiederverwendet (statt 4 Einzelaufrufe)
+pub fn calculate_all_interior_angles(vertices: &[Point; 4]) -> [f64; 4] {
+    // Kantenvektoren: edge[i] = vertices[i+1] - vertices[i]
+    let mut edges = [(0.0_f64, 0.0_f64); 4];
+    for i in 0..4 {
+        let next = (i + 1) % 4;
+        edges[i] = (
+            vertices[next].x - vertices[i].x,
+            vertices[next].y - vertices[i].y,
+        );
     }
-}
 
-/// Legacy-Funktion für Kompatibilität
-pub fn format_length_consistent(mm: f64, use_cm: bool) -> String {
-    let um = (mm * 1000.0).round() as i64;
-    format_length_um(um, use_cm)
+    let mut angles = [0.0_f64; 4];
+    for i in 0..4 {
+        // Am Vertex i treffen sich edge[i-1] (eingehend) und edge[i] (ausgehend)
+        let prev = (i + 3) % 4;
+        let (v1_x, v1_y) = (-edges[prev].0, -edges[prev].1);
+        let (v2_x, v2_y) = edges[i];
+
+        let dot = v1_x * v2_x + v1_y * v2_y;
+        let cross = v1_x * v2_y - v1_y * v2_x;
+        angles[i] = cross.atan2(dot).abs().to_degrees();
+    }
+    angles
 }
 
 /// Berechnet den Winkel zwischen zwei Vektoren (in Grad, 0-180°)
@@ -72,7 +72,7 @@ pub fn angle_between_vectors(v1_x: f64, v1_y: f64, v2_x: f64, v2_y: f64) -> f64
     }
     
     let cos_angle = (dot / (len1 * len2)).clamp(-1.0, 1.0);
-    cos_angle.acos() * 180.0 / PI
+    cos_angle.acos().to_degrees()
 }
 
 /// Berechnet den Schnittwinkel einer Linie mit einer Seite des Vierecks
@@ -115,7 +115,9 @@ pub fn find_circle_intersection(
     }
 
     let a = (radius_um * radius_um - radius2_um * radius2_um + d * d) / (2.0 * d);
-    let h = (radius_um * radius_um - a * a).sqrt();
+    // Bei (fast) tangentialen Kreisen kann der Radikand durch Rundung
+    // minimal negativ werden — abfangen statt NaN-Vertices zu erzeugen
+    let h = (radius_um * radius_um - a * a).max(0.0).sqrt();
 
     let px = center1.x + a * dx / d;
     let py = center1.y + a * dy / d;
@@ -126,4 +128,43 @@ pub fn find_circle_intersection(
 
     // Wähle den Punkt mit größerer y-Koordinate
     Ok(if p1.y > p2.y { p1 } else { p2 })
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_all_interior_angles_square() {
+        // Einheitsquadrat: alle Innenwinkel 90°
+        let vertices = [
+            Point::new(0.0, 0.0),
+            Point::new(1000.0, 0.0),
+            Point::new(1000.0, 1000.0),
+            Point::new(0.0, 1000.0),
+        ];
+
+        let angles = calculate_all_interior_angles(&vertices);
+        for (i, angle) in angles.iter().enumerate() {
+            assert!((angle - 90.0).abs() < 1e-9, "Winkel {} war {}", i, angle);
+        }
+    }
+
+    #[test]
+    fn test_all_interior_angles_matches_single() {
+        let vertices = [
+            Point::new(0.0, 0.0),
+            Point::new(2000.0, 0.0),
+            Point::new(2500.0, 1500.0),
+            Point::new(-300.0, 1200.0),
+        ];
+
+        let angles = calculate_all_interior_angles(&vertices);
+        for i in 0..4 {
+            let prev = (i + 3) % 4;
+            let next = (i + 1) % 4;
+            let single = calculate_interior_angle(&vertices[prev], &vertices[i], &vertices[next]);
+            assert!((angles[i] - single).abs() < 1e-9);
+        }
+    }
 }
\ No newline at end of file
@@ -1,7 +1,7 @@
 // Validierungs- und Berechnungslogik
 
 use super::types::Quadrilateral;
-use super::utils::calculate_interior_angle;
+use super::utils::calculate_all_interior_angles;
 
 impl Quadrilateral {
     /// Hauptfunktion zur Berechnung des Vierecks
@@ -38,12 +38,69 @@ impl Quadrilateral {
         // Berechne fehlende Winkel
         self.calculate_missing_angles()?;
 
+        // Schnellpfad: Erfüllen die vorhandenen Vertices die Vorgaben
+        // bereits (z.B. erneuter Aufruf mit unveränderten Werten),
+        // kann die komplette Konstruktion übersprungen werden
+        if self.constraints_already_satisfied() {
+            self.fill_missing_sides_from_vertices();
+            self.calculate_angles_from_vertices();
+            return Ok(());
+        }
+
         // Konstruiere das Viereck
         self.construct_quadrilateral()?;
 
         Ok(())
     }
 
+    /// Prüft ob die aktuellen Vertices alle gegebenen Maße bereits erfüllen
+    pub(crate) fn constraints_already_satisfied(&self) -> bool {
+        // Frisch initialisierte Vierecke (alle Vertices im Ursprung) zählen nicht
+        if (0..4).all(|i| self.get_side_length_um(i) == 0) {
+            return false;
+        }
+
+        let sides = [self.side_ab_um, self.side_bc_um, self.side_cd_um, self.side_da_um];
+        for (i, side) in sides.iter().enumerate() {
+            if let Some(expected_um) = side {
+                let calculated_um = self.get_side_length_um(i);
+                // Gleiche Toleranz wie validate_length_um: 1µm oder 0.1%
+                let tolerance_um = 1_i64.max((*expected_um as f64 * 0.001) as i64);
+                if (calculated_um - expected_um).abs() > tolerance_um {
+                    return false;
+                }
+            }
+        }
+
+        let actual = calculate_all_interior_angles(&self.vertices);
+        let given = [self.angle_a, self.angle_b, self.angle_c, self.angle_d];
+        for (i, angle) in given.iter().enumerate() {
+            if let Some(expected_deg) = angle {
+                if (actual[i] - expected_deg).abs() > 0.1 {
+                    return false;
+                }
+            }
+        }
+
+        true
+    }
+
+    /// Ergänzt nicht gegebene Seitenlängen aus den Vertices
+    pub(crate) fn fill_missing_sides_from_vertices(&mut self) {
+        if self.side_ab_um.is_none() {
+            self.side_ab_um = Some(self.get_side_length_um(0));
+        }
+        if self.side_bc_um.is_none() {
+            self.side_bc_um = Some(self.get_side_length_um(1));
+        }
+        if self.side_cd_um.is_none() {
+            self.side_cd_um = Some(self.get_side_length_um(2));
+        }
+        if self.side_da_um.is_none() {
+            self.side_da_um = Some(self.get_side_length_um(3));
+        }
+    }
+
     /// Prüft ob mindestens 2 benachbarte Winkel gegeben sind
     pub(crate) fn has_adjacent_angles(&self) -> bool {
         let angles = [
@@ -108,34 +165,22 @@ impl Quadrilateral {
     }
 
     /// Berechnet alle fehlenden Winkel aus den Vertices
+    /// Alle vier Innenwinkel werden in einem Durchlauf bestimmt,
+    /// statt pro Winkel die Kantenvektoren neu aufzubauen
     pub(crate) fn calculate_angles_from_vertices(&mut self) {
+        let angles = calculate_all_interior_angles(&self.vertices);
+
         if self.angle_a.is_none() {
-            self.angle_a = Some(calculate_interior_angle(
-                &self.vertices[3],
-                &self.vertices[0],
-                &self.vertices[1],
-            ));
+            self.angle_a = Some(angles[0]);
         }
         if self.angle_b.is_none() {
-            self.angle_b = Some(calculate_interior_angle(
-                &self.vertices[0],
-                &self.vertices[1],
-                &self.vertices[2],
-            ));
+            self.angle_b = Some(angles[1]);
         }
         if self.angle_c.is_none() {
-            self.angle_c = Some(calculate_interior_angle(
-                &self.vertices[1],
-                &self.vertices[2],
-                &self.vertices[3],
-            ));
+            self.angle_c = Some(angles[2]);
         }
         if self.angle_d.is_none() {
-            self.angle_d = Some(calculate_interior_angle(
-                &self.vertices[2],
-                &self.vertices[3],
-                &self.vertices[0],
-            ));
+            self.angle_d = Some(angles[3]);
         }
     }
 
@@ -4,12 +4,31 @@ mod updater;
 
 use eframe::egui;
 
+/// Lädt das Fenster-Icon aus der einkompilierten Ressource
+/// (kein Dateisystem-Zugriff, funktioniert auf jedem Rechner)
+fn load_app_icon() -> Option<egui::IconData> {
+    let image = image::load_from_memory(include_bytes!("../Zeichner.png"))
+        .ok()?
+        .into_rgba8();
+    let (width, height) = image.dimensions();
+    Some(egui::IconData {
+        rgba: image.into_raw(),
+        width,
+        height,
+    })
+}
+
 #[tokio::main]
 async fn main() -> Result<(), eframe::Error> {
+    let mut viewport = egui::ViewportBuilder::default()
+        .with_fullscreen(true)
+        .with_title("Einfache CAD App für Vierecke");
+    if let Some(icon) = load_app_icon() {
+        viewport = viewport.with_icon(icon);
+    }
+
     let options = eframe::NativeOptions {
-        viewport: egui::ViewportBuilder::default()
-            .with_fullscreen(true)
-            .with_title("Einfache CAD App für Vierecke"),
+        viewport,
         ..Default::default()
     };
 
@@ -2,15 +2,35 @@ use crate::geometry::*;
 use crate::geometry::utils::{distance_um, calculate_intersection_angle};
 use crate::updater::{self, UpdateInfo};
 use eframe::egui;
-use egui::{Color32, Pos2, Stroke, Vec2};
+use egui::{Color32, Pos2, Shape, Stroke, Vec2};
 use std::path::PathBuf;
 use std::sync::{Arc, Mutex};
 
 pub struct CadApp {
     quad: Quadrilateral,
     calculated: bool,
+    // Bounding-Box der Vertices (min_x, min_y, max_x, max_y) in µm;
+    // wird nur bei Neuberechnung aktualisiert statt pro Frame gescannt
+    quad_bounds: (f64, f64, f64, f64),
+    // Fertig formatierte Beschriftungen der Seiten und Winkel;
+    // ändern sich nur bei Neuberechnung, nicht pro Frame
+    side_labels: [String; 4],
+    angle_labels: [String; 4],
+    // Seitenlängen in µm, einmal pro Neuberechnung bestimmt
+    side_lengths_um: [i64; 4],
+    // Einheitenwahl für alle Längenbeschriftungen (cm unter 10 m);
+    // wird einmal pro Neuberechnung entschieden statt pro Label
+    use_cm: bool,
+    // Gecachte Welt→Bildschirm-Transformation samt Canvas-Rechteck,
+    // für das sie berechnet wurde
+    view_cache: Option<(egui::Rect, ViewTransform)>,
+    // Wiederverwendeter Puffer der projizierten Linien-Endpunkte;
+    // einmal pro Frame gefüllt, von Zeichnen und Hit-Tests geteilt
+    line_screen: Vec<(Pos2, Pos2)>,
     error_message: Option<String>,
     custom_lines: Vec<CustomLine>,
+    // Parallel zu custom_lines: gecachte Beschriftungen pro Linie
+    line_labels: Vec<LineLabels>,
     
     // Eingabefelder
     input_ab: String,
@@ -30,7 +50,21 @@ pub struct CadApp {
     dragging_line_idx: Option<usize>,
     drag_offset: Vec2,
     hovered_line: Option<usize>,
+    // Endpunkt-Treffer aus demselben Hover-Test; der Drag-Start liest
+    // ihn direkt statt die Linienliste erneut zu durchsuchen
+    hovered_endpoint: Option<(usize, bool)>,
+    // Zeigerposition des letzten Hover-Tests; unveränderte Position
+    // bedeutet unverändertes Ergebnis, der Scan entfällt dann
+    last_hover_pos: Option<Pos2>,
     
+    // Letzte erfolgreich berechnete Eingaben, um wiederholte
+    // identische Berechnungen (z.B. Doppelklick) zu überspringen
+    last_calc_inputs: Option<[String; 8]>,
+
+    // Ergebnis des Screenshot-Workers (Erfolg/Fehler samt Dateiname);
+    // wird vom UI-Thread nur gelesen und angezeigt
+    screenshot_status: Arc<Mutex<Option<String>>>,
+
     // Update State
     update_info: Arc<Mutex<Option<UpdateInfo>>>,
     checking_update: bool,
@@ -43,8 +77,16 @@ impl Default for CadApp {
         Self {
             quad: Quadrilateral::new(),
             calculated: false,
+            quad_bounds: (0.0, 0.0, 0.0, 0.0),
+            side_labels: Default::default(),
+            angle_labels: Default::default(),
+            side_lengths_um: [0; 4],
+            use_cm: true,
+            view_cache: None,
+            line_screen: Vec::new(),
             error_message: None,
             custom_lines: Vec::new(),
+            line_labels: Vec::new(),
             input_ab: String::new(),
             input_bc: String::new(),
             input_cd: String::new(),
@@ -60,6 +102,10 @@ impl Default for CadApp {
             dragging_line_idx: None,
             drag_offset: Vec2::ZERO,
             hovered_line: None,
+            hovered_endpoint: None,
+            last_hover_pos: None,
+            last_calc_inputs: None,
+            screenshot_status: Arc::new(Mutex::new(None)),
             update_info: Arc::new(Mutex::new(None)),
             checking_update: false,
             show_update_dialog: false,
@@ -68,17 +114,94 @@ impl Default for CadApp {
     }
 }
 
+/// Abbildung von Weltkoordinaten (µm) auf Bildschirmkoordinaten,
+/// als fertige Affintransformation x' = x·scale + offset abgelegt —
+/// pro Achse bleibt eine Multiplikation plus eine Addition
+#[derive(Clone, Copy, PartialEq)]
+struct ViewTransform {
+    scale: f64,
+    offset_x: f64,
+    offset_y: f64,
+}
+
+impl ViewTransform {
+    #[inline]
+    fn to_screen(&self, p: &Point) -> Pos2 {
+        Pos2::new(
+            (p.x * self.scale + self.offset_x) as f32,
+            (p.y * self.scale + self.offset_y) as f32,
+        )
+    }
+}
+
+/// Fertig formatierte Beschriftungen einer gezeichneten Linie;
+/// werden nur beim Anlegen/Verschieben der Linie neu aufgebaut
+struct LineLabels {
+    length: String,
+    start_angle: String,
+    end_angle: String,
+    segment_start: String,
+    segment_end: String,
+}
+
+// Feste Beschriftungen der Ecken und Seiten
+const VERTEX_LABELS: [&str; 4] = ["A", "B", "C", "D"];
+const SIDE_NAMES: [&str; 4] = ["AB", "BC", "CD", "DA"];
+
+// Farbpalette der Zeichenfläche — einmal definiert statt pro Frame
+// inline konstruiert
+const QUAD_EDGE_COLOR: Color32 = Color32::from_rgb(50, 50, 200);
+const VERTEX_COLOR: Color32 = Color32::from_rgb(200, 50, 50);
+const ANGLE_LABEL_COLOR: Color32 = Color32::from_rgb(100, 100, 100);
+const SIDE_LABEL_COLOR: Color32 = Color32::from_rgb(0, 120, 0);
+const LINE_COLOR: Color32 = Color32::from_rgb(200, 100, 0);
+const LINE_HOVER_COLOR: Color32 = Color32::from_rgb(255, 150, 0);
+const LINE_LABEL_COLOR: Color32 = Color32::from_rgb(56, 62, 66); // Anthrazit
+const LINE_ENDPOINT_COLOR: Color32 = Color32::from_rgb(255, 200, 0);
+const SEGMENT_LABEL_COLOR: Color32 = Color32::from_rgb(150, 150, 150);
+const PREVIEW_LINE_COLOR: Color32 = Color32::from_rgba_premultiplied(100, 50, 0, 128);
+
+// Schriftgrößen der Zeichenfläche, analog zur Farbpalette einmal
+// definiert statt pro Textaufruf konstruiert
+const FONT_VERTEX_LABEL: egui::FontId = egui::FontId::proportional(28.0);
+const FONT_QUAD_LABEL: egui::FontId = egui::FontId::proportional(22.0);
+const FONT_LINE_LABEL: egui::FontId = egui::FontId::proportional(20.0);
+const FONT_LINE_ANGLE: egui::FontId = egui::FontId::proportional(16.0);
+const FONT_SEGMENT_LABEL: egui::FontId = egui::FontId::proportional(14.0);
+
 // ========== HILFSFUNKTION: KOMMA-FORMATIERUNG ==========
 fn format_with_comma(value: f64) -> String {
     format!("{:.3}", value).replace('.', ",")
 }
 
-fn format_angle_with_comma(value: f64) -> String {
-    format!("{:.3}", value).replace('.', ",")
+/// Parst ein Eingabefeld: Komma als Dezimaltrenner erlaubt,
+/// leere oder unlesbare Felder ergeben None
+fn parse_input(text: &str) -> Option<f64> {
+    if text.is_empty() {
+        return None;
+    }
+    text.replace(',', ".").parse::<f64>().ok()
+}
+
+/// Formatiert eine Länge in mm als cm- oder m-Angabe mit Komma;
+/// die cm/m-Entscheidung trifft der Aufrufer einmal pro Kontext
+fn format_length_mm_comma(mm: f64, use_cm: bool) -> String {
+    if use_cm {
+        format!("{} cm", format_with_comma(mm / 10.0))
+    } else {
+        format!("{} m", format_with_comma(mm / 1000.0))
+    }
 }
 
 impl eframe::App for CadApp {
     fn update(&mut self, ctx: &egui::Context, _frame: &mut eframe::Frame) {
+        // Ergebnis der asynchronen Update-Prüfung abholen
+        // (der Worker stößt per request_repaint einen Frame an)
+        if self.checking_update && self.update_info.lock().unwrap().is_some() {
+            self.checking_update = false;
+            self.show_update_dialog = true;
+        }
+
         // Linkes Panel für Eingaben mit Scrollbar
         egui::SidePanel::left("input_panel")
             .min_width(380.0)
@@ -168,47 +291,24 @@ impl eframe::App for CadApp {
                                             ui.label("✅ Geometrisch korrekte Werte:");
                                             ui.add_space(8.0);
                                             
-                                            let max_length_um = [
-                                                self.quad.side_ab_um.unwrap_or(0),
-                                                self.quad.side_bc_um.unwrap_or(0),
-                                                self.quad.side_cd_um.unwrap_or(0),
-                                                self.quad.side_da_um.unwrap_or(0),
-                                            ].iter().fold(0_i64, |a, &b| a.max(b));
-                                            
-                                            let use_cm = max_length_um < 10_000_000;
+                                            let use_cm = self.use_cm;
                                             
                                             ui.group(|ui| {
                                                 ui.label(egui::RichText::new("Seitenlängen:").strong());
                                                 if let Some(mm) = self.quad.get_side_mm("AB") {
-                                                    let formatted = if use_cm {
-                                                        format!("{} cm", format_with_comma(mm / 10.0))
-                                                    } else {
-                                                        format!("{} m", format_with_comma(mm / 1000.0))
-                                                    };
+                                                    let formatted = format_length_mm_comma(mm, use_cm);
                                                     ui.label(format!("  AB: {}", formatted));
                                                 }
                                                 if let Some(mm) = self.quad.get_side_mm("BC") {
-                                                    let formatted = if use_cm {
-                                                        format!("{} cm", format_with_comma(mm / 10.0))
-                                                    } else {
-                                                        format!("{} m", format_with_comma(mm / 1000.0))
-                                                    };
+                                                    let formatted = format_length_mm_comma(mm, use_cm);
                                                     ui.label(format!("  BC: {}", formatted));
                                                 }
                                                 if let Some(mm) = self.quad.get_side_mm("CD") {
-                                                    let formatted = if use_cm {
-                                                        format!("{} cm", format_with_comma(mm / 10.0))
-                                                    } else {
-                                                        format!("{} m", format_with_comma(mm / 1000.0))
-                                                    };
+                                                    let formatted = format_length_mm_comma(mm, use_cm);
                                                     ui.label(format!("  CD: {}", formatted));
                                                 }
                                                 if let Some(mm) = self.quad.get_side_mm("DA") {
-                                                    let formatted = if use_cm {
-                                                        format!("{} cm", format_with_comma(mm / 10.0))
-                                                    } else {
-                                                        format!("{} m", format_with_comma(mm / 1000.0))
-                                                    };
+                                                    let formatted = format_length_mm_comma(mm, use_cm);
                                                     ui.label(format!("  DA: {}", formatted));
                                                 }
                                             });
@@ -218,16 +318,16 @@ impl eframe::App for CadApp {
                                             ui.group(|ui| {
                                                 ui.label(egui::RichText::new("Innenwinkel:").strong());
                                                 if let Some(a) = self.quad.angle_a {
-                                                    ui.label(format!("  A: {}°", format_angle_with_comma(a)));
+                                                    ui.label(format!("  A: {}°", format_with_comma(a)));
                                                 }
                                                 if let Some(b) = self.quad.angle_b {
-                                                    ui.label(format!("  B: {}°", format_angle_with_comma(b)));
+                                                    ui.label(format!("  B: {}°", format_with_comma(b)));
                                                 }
                                                 if let Some(c) = self.quad.angle_c {
-                                                    ui.label(format!("  C: {}°", format_angle_with_comma(c)));
+                                                    ui.label(format!("  C: {}°", format_with_comma(c)));
                                                 }
                                                 if let Some(d) = self.quad.angle_d {
-                                                    ui.label(format!("  D: {}°", format_angle_with_comma(d)));
+                                                    ui.label(format!("  D: {}°", format_with_comma(d)));
                                                 }
                                             });
                                         });
@@ -239,7 +339,10 @@ impl eframe::App for CadApp {
                         ui.separator();
                         
                         if ui.button("📸 Screenshot erstellen").clicked() {
-                            self.take_screenshot();
+                            self.take_screenshot(ctx);
+                        }
+                        if let Some(status) = self.screenshot_status.lock().unwrap().as_ref() {
+                            ui.label(status);
                         }
 
                         ui.add_space(10.0);
@@ -249,7 +352,7 @@ impl eframe::App for CadApp {
                             ui.label("Prüfe Updates...");
                         } else {
                             if ui.button("🔄 Nach Updates suchen").clicked() {
-                                self.check_for_updates();
+                                self.check_for_updates(ctx);
                             }
                         }
 
@@ -385,8 +488,29 @@ impl eframe::App for CadApp {
 
 impl CadApp {
     fn calculate_quadrilateral(&mut self) {
+        // Unveränderte Eingaben erneut zu berechnen ergäbe dasselbe Viereck
+        // und würde nur die gezeichneten Linien verwerfen
+        let inputs = [
+            self.input_ab.clone(),
+            self.input_bc.clone(),
+            self.input_cd.clone(),
+            self.input_da.clone(),
+            self.input_angle_a.clone(),
+            self.input_angle_b.clone(),
+            self.input_angle_c.clone(),
+            self.input_angle_d.clone(),
+        ];
+        if self.calculated && self.last_calc_inputs.as_ref() == Some(&inputs) {
+            return;
+        }
+
         self.error_message = None;
-        
+
+        // Snapshot für den Fehlerfall: eine fehlgeschlagene Berechnung soll
+        // das zuletzt gültige Viereck samt Zeichnung nicht zerstören
+        let prev_quad = self.quad.clone();
+        let prev_calculated = self.calculated;
+
         // Setze ALLE Werte zurück, damit leere Felder auch wirklich None werden
         self.quad.side_ab_um = None;
         self.quad.side_bc_um = None;
@@ -397,311 +521,372 @@ impl CadApp {
         self.quad.angle_c = None;
         self.quad.angle_d = None;
         
-        // Jetzt setze nur die ausgefüllten Felder
-        if !self.input_ab.is_empty() {
-            if let Ok(mm) = self.input_ab.replace(',', ".").parse::<f64>() {
-                self.quad.set_side_mm("AB", mm);
-            }
-        }
-        if !self.input_bc.is_empty() {
-            if let Ok(mm) = self.input_bc.replace(',', ".").parse::<f64>() {
-                self.quad.set_side_mm("BC", mm);
-            }
-        }
-        if !self.input_cd.is_empty() {
-            if let Ok(mm) = self.input_cd.replace(',', ".").parse::<f64>() {
-                self.quad.set_side_mm("CD", mm);
+        // Jetzt setze nur die ausgefüllten Felder — ein Parser für alle
+        for (name, input) in [
+            ("AB", &self.input_ab),
+            ("BC", &self.input_bc),
+            ("CD", &self.input_cd),
+            ("DA", &self.input_da),
+        ] {
+            if let Some(mm) = parse_input(input) {
+                self.quad.set_side_mm(name, mm);
             }
         }
-        if !self.input_da.is_empty() {
-            if let Ok(mm) = self.input_da.replace(',', ".").parse::<f64>() {
-                self.quad.set_side_mm("DA", mm);
-            }
-        }
-        
-        // Für Winkel: .parse().ok() gibt automatisch None bei leerem String
-        if !self.input_angle_a.is_empty() {
-            self.quad.angle_a = self.input_angle_a.replace(',', ".").parse::<f64>().ok();
-        }
-        if !self.input_angle_b.is_empty() {
-            self.quad.angle_b = self.input_angle_b.replace(',', ".").parse::<f64>().ok();
-        }
-        if !self.input_angle_c.is_empty() {
-            self.quad.angle_c = self.input_angle_c.replace(',', ".").parse::<f64>().ok();
-        }
-        if !self.input_angle_d.is_empty() {
-            self.quad.angle_d = self.input_angle_d.replace(',', ".").parse::<f64>().ok();
-        }
+
+        self.quad.angle_a = parse_input(&self.input_angle_a);
+        self.quad.angle_b = parse_input(&self.input_angle_b);
+        self.quad.angle_c = parse_input(&self.input_angle_c);
+        self.quad.angle_d = parse_input(&self.input_angle_d);
 
         match self.quad.calculate() {
             Ok(_) => {
                 self.calculated = true;
                 self.custom_lines.clear();
+                self.line_labels.clear();
+                self.last_calc_inputs = Some(inputs);
+                self.update_quad_bounds();
+                self.rebuild_static_labels();
+                self.view_cache = None;
             }
             Err(e) => {
                 self.error_message = Some(e);
-                self.calculated = false;
+                // Vorherigen Zustand wiederherstellen statt mit halb
+                // mutierten Werten (auto-ergänzte Winkel etc.) weiterzuarbeiten
+                self.quad = prev_quad;
+                self.calculated = prev_calculated;
+                self.last_calc_inputs = None;
             }
         }
     }
 
-    fn draw_quadrilateral(&mut self, ui: &mut egui::Ui) {
-        let available_size = ui.available_size();
-        let (response, painter) = ui.allocate_painter(available_size, egui::Sense::click_and_drag());
+    /// Aktualisiert die gecachte Bounding-Box nach einer Neuberechnung
+    fn update_quad_bounds(&mut self) {
+        self.quad_bounds = self.quad.bounds();
+    }
 
-        let mut min_x = f64::MAX;
-        let mut max_x = f64::MIN;
-        let mut min_y = f64::MAX;
-        let mut max_y = f64::MIN;
+    /// Baut die Seiten- und Winkelbeschriftungen nach einer Neuberechnung auf,
+    /// damit die Formatierung nicht in jedem Frame erneut läuft
+    fn rebuild_static_labels(&mut self) {
+        self.side_lengths_um = self.quad.all_side_lengths_um();
+        let max_length_um = self.side_lengths_um.iter().copied().max().unwrap_or(0);
+        self.use_cm = max_length_um < 10_000_000;
+        let use_cm = self.use_cm;
+
+        let angles = [self.quad.angle_a, self.quad.angle_b, self.quad.angle_c, self.quad.angle_d];
+        for i in 0..4 {
+            let length_mm = Quadrilateral::um_to_mm(self.side_lengths_um[i]);
+            self.side_labels[i] =
+                format!("{}: {}", SIDE_NAMES[i], format_length_mm_comma(length_mm, use_cm));
+
+            self.angle_labels[i] = match angles[i] {
+                Some(angle) => format!("{}°", format_with_comma(angle)),
+                None => String::new(),
+            };
+        }
+    }
 
-        for v in &self.quad.vertices {
-            min_x = min_x.min(v.x);
-            max_x = max_x.max(v.x);
-            min_y = min_y.min(v.y);
-            max_y = max_y.max(v.y);
+    /// Liefert die Welt→Bildschirm-Transformation für das Canvas-Rechteck,
+    /// aus dem Cache solange weder Rechteck noch Viereck sich ändern
+    fn view_transform(&mut self, rect: egui::Rect) -> ViewTransform {
+        if let Some((cached_rect, transform)) = self.view_cache {
+            if cached_rect == rect {
+                return transform;
+            }
         }
 
+        let available_size = rect.size();
+        let (min_x, min_y, max_x, max_y) = self.quad_bounds;
         let width = max_x - min_x;
         let height = max_y - min_y;
-        
+
         let padding = 120.0;
         let scale_x = (available_size.x - 2.0 * padding) / width as f32;
         let scale_y = (available_size.y - 2.0 * padding) / height as f32;
-        let scale = scale_x.min(scale_y);
+        let mut scale = scale_x.min(scale_y);
+        // Entartete Bounding-Box (Breite/Höhe 0) oder zu kleines Canvas:
+        // statt NaN/negativer Skalierung auf 0 setzen — das Viereck
+        // kollabiert dann sichtbar in einen Punkt statt den Tessellator
+        // mit ungültigen Koordinaten zu füttern
+        if !scale.is_finite() || scale <= 0.0 {
+            scale = 0.0;
+        }
 
         let offset_x = (available_size.x - width as f32 * scale) / 2.0;
         let offset_y = (available_size.y - height as f32 * scale) / 2.0;
 
-        let to_screen = |p: &Point| -> Pos2 {
-            Pos2::new(
-                response.rect.min.x + offset_x + (p.x - min_x) as f32 * scale,
-                response.rect.min.y + offset_y + (p.y - min_y) as f32 * scale,
-            )
+        // Bounding-Box-Verschiebung gleich in den Offset einrechnen,
+        // damit to_screen ohne die Subtraktion von min_x/min_y auskommt
+        let scale = scale as f64;
+        let transform = ViewTransform {
+            scale,
+            offset_x: (rect.min.x + offset_x) as f64 - min_x * scale,
+            offset_y: (rect.min.y + offset_y) as f64 - min_y * scale,
         };
+        self.view_cache = Some((rect, transform));
+        transform
+    }
 
-        let screen_vertices: Vec<Pos2> = self.quad.vertices.iter().map(to_screen).collect();
-        
-        for i in 0..4 {
-            let next = (i + 1) % 4;
-            painter.line_segment(
-                [screen_vertices[i], screen_vertices[next]],
-                Stroke::new(4.0, Color32::from_rgb(50, 50, 200)),
-            );
+    /// Baut die gecachten Beschriftungen für eine Linie auf
+    fn make_line_labels(&self, line: &CustomLine) -> LineLabels {
+        let format_length = |mm: f64| format_length_mm_comma(mm, self.use_cm);
+
+        // Die Teilstrecken stecken bereits in den Ratio-Parametern der
+        // Endpunkte: ratio × Seitenlänge statt erneuter Distanzmessung
+        let segment_start_mm =
+            line.start_ratio * self.side_lengths_um[line.start_side % 4] as f64 / 1000.0;
+        let segment_end_mm =
+            (1.0 - line.end_ratio) * self.side_lengths_um[line.end_side % 4] as f64 / 1000.0;
+
+        LineLabels {
+            length: format_length(line.length_um as f64 / 1000.0),
+            start_angle: format!("{}°", format_with_comma(line.start_angle)),
+            end_angle: format!("{}°", format_with_comma(line.end_angle)),
+            segment_start: format_length(segment_start_mm),
+            segment_end: format_length(segment_end_mm),
         }
+    }
 
-        let labels = ["A", "B", "C", "D"];
-        let angles = [self.quad.angle_a, self.quad.angle_b, self.quad.angle_c, self.quad.angle_d];
+    /// Sucht einen Linien-Endpunkt unter dem Zeiger (Radius 12 px)
+    /// Liefert (Linienindex, true wenn der Start-Punkt näher liegt)
+    fn find_endpoint_at(&self, pos: Pos2) -> Option<(usize, bool)> {
+        for (idx, &(start_screen, end_screen)) in self.line_screen.iter().enumerate() {
+            // Quadrierte Distanzen reichen: sqrt ist monoton, sowohl der
+            // Schwellwert- als auch der Näher-dran-Vergleich bleiben gleich
+            let dist_sq_start = (pos - start_screen).length_sq();
+            let dist_sq_end = (pos - end_screen).length_sq();
+
+            if dist_sq_start < 12.0 * 12.0 || dist_sq_end < 12.0 * 12.0 {
+                return Some((idx, dist_sq_start < dist_sq_end));
+            }
+        }
+        None
+    }
+
+    /// Sucht eine Linie, deren Verlauf unter dem Zeiger liegt (Toleranz 15 px)
+    fn find_line_body_at(&self, pos: Pos2) -> Option<usize> {
+        const TOL: f32 = 15.0;
+        for (idx, &(start_screen, end_screen)) in self.line_screen.iter().enumerate() {
+            // Billiger Bounding-Box-Test zuerst: liegt der Zeiger weiter
+            // als die Toleranz außerhalb der Box, kann die Strecke nicht
+            // getroffen sein und die Projektion entfällt
+            if pos.x < start_screen.x.min(end_screen.x) - TOL
+                || pos.x > start_screen.x.max(end_screen.x) + TOL
+                || pos.y < start_screen.y.min(end_screen.y) - TOL
+                || pos.y > start_screen.y.max(end_screen.y) + TOL
+            {
+                continue;
+            }
+
+            if point_to_line_distance_sq(pos, start_screen, end_screen) < TOL * TOL {
+                return Some(idx);
+            }
+        }
+        None
+    }
+
+    fn draw_quadrilateral(&mut self, ui: &mut egui::Ui) {
+        let available_size = ui.available_size();
+        let (response, painter) = ui.allocate_painter(available_size, egui::Sense::click_and_drag());
+
+        let transform = self.view_transform(response.rect);
+        let to_screen = |p: &Point| transform.to_screen(p);
+
+        // Festes Array statt Vec: keine Heap-Allokation pro Frame
+        let screen_vertices: [Pos2; 4] = [
+            to_screen(&self.quad.vertices[0]),
+            to_screen(&self.quad.vertices[1]),
+            to_screen(&self.quad.vertices[2]),
+            to_screen(&self.quad.vertices[3]),
+        ];
         
+        // Alle vier Kanten als ein geschlossener Linienzug statt
+        // vier einzelner Zeichenaufrufe
+        painter.add(Shape::closed_line(
+            screen_vertices.to_vec(),
+            Stroke::new(4.0, QUAD_EDGE_COLOR),
+        ));
+
         for i in 0..4 {
-            painter.circle_filled(screen_vertices[i], 8.0, Color32::from_rgb(200, 50, 50));
-            
+            painter.circle_filled(screen_vertices[i], 8.0, VERTEX_COLOR);
+
             let offset = Vec2::new(-25.0, -25.0);
             painter.text(
                 screen_vertices[i] + offset,
                 egui::Align2::CENTER_CENTER,
-                labels[i],
-                egui::FontId::proportional(28.0),
+                VERTEX_LABELS[i],
+                FONT_VERTEX_LABEL,
                 Color32::BLACK,
             );
 
-            if let Some(angle) = angles[i] {
+            if !self.angle_labels[i].is_empty() {
                 let angle_offset = Vec2::new(30.0, 30.0);
                 painter.text(
                     screen_vertices[i] + angle_offset,
                     egui::Align2::LEFT_TOP,
-                    format!("{}°", format_angle_with_comma(angle)),
-                    egui::FontId::proportional(22.0),
-                    Color32::from_rgb(100, 100, 100),
+                    self.angle_labels[i].as_str(),
+                    FONT_QUAD_LABEL,
+                    ANGLE_LABEL_COLOR,
                 );
             }
         }
 
-        let side_names = ["AB", "BC", "CD", "DA"];
-        
-        let max_length_um = [
-            self.quad.get_side_length_um(0),
-            self.quad.get_side_length_um(1),
-            self.quad.get_side_length_um(2),
-            self.quad.get_side_length_um(3),
-        ].iter().fold(0_i64, |a, &b| a.max(b));
-        
-        let use_cm = max_length_um < 10_000_000;
-        
         for i in 0..4 {
             let next = (i + 1) % 4;
             let mid = Pos2::new(
                 (screen_vertices[i].x + screen_vertices[next].x) / 2.0,
                 (screen_vertices[i].y + screen_vertices[next].y) / 2.0,
             );
-            
-            let length_mm = self.quad.get_side_length_mm(i);
-            let formatted = if use_cm {
-                format!("{}: {} cm", side_names[i], format_with_comma(length_mm / 10.0))
-            } else {
-                format!("{}: {} m", side_names[i], format_with_comma(length_mm / 1000.0))
-            };
-            
+
             painter.text(
                 mid,
                 egui::Align2::CENTER_CENTER,
-                formatted,
-                egui::FontId::proportional(22.0),
-                Color32::from_rgb(0, 120, 0),
+                self.side_labels[i].as_str(),
+                FONT_QUAD_LABEL,
+                SIDE_LABEL_COLOR,
             );
         }
 
-        // Zeichne custom lines
+        // Bildschirm-Endpunkte aller Linien einmal projizieren; Zeichnen
+        // und Hit-Tests in diesem Frame greifen auf den Puffer zu
+        self.line_screen.clear();
+        for line in &self.custom_lines {
+            self.line_screen
+                .push((transform.to_screen(&line.start), transform.to_screen(&line.end)));
+        }
+
+        // Zeichne custom lines: alle Segmente gesammelt in einem
+        // Painter-Aufruf statt einem line_segment pro Linie
+        let line_shapes: Vec<Shape> = (0..self.custom_lines.len())
+            .map(|idx| {
+                let (start_screen, end_screen) = self.line_screen[idx];
+                let is_hovered = self.hovered_line == Some(idx);
+                let line_color = if is_hovered {
+                    LINE_HOVER_COLOR
+                } else {
+                    LINE_COLOR
+                };
+                let line_width = if is_hovered { 4.0 } else { 3.0 };
+                Shape::line_segment(
+                    [start_screen, end_screen],
+                    Stroke::new(line_width, line_color),
+                )
+            })
+            .collect();
+        painter.extend(line_shapes);
+
         for (idx, line) in self.custom_lines.iter().enumerate() {
-            let start_screen = to_screen(&line.start);
-            let end_screen = to_screen(&line.end);
-            
-            let is_hovered = self.hovered_line == Some(idx);
-            let line_color = if is_hovered {
-                Color32::from_rgb(255, 150, 0)
-            } else {
-                Color32::from_rgb(200, 100, 0)
-            };
-            let line_width = if is_hovered { 4.0 } else { 3.0 };
-            
-            painter.line_segment(
-                [start_screen, end_screen],
-                Stroke::new(line_width, line_color),
-            );
+            let (start_screen, end_screen) = self.line_screen[idx];
 
             let mid = Pos2::new(
                 (start_screen.x + end_screen.x) / 2.0,
                 (start_screen.y + end_screen.y) / 2.0,
             );
-            
-            let length_mm = line.length_um as f64 / 1000.0;
-            let formatted = if use_cm {
-                format!("{} cm", format_with_comma(length_mm / 10.0))
-            } else {
-                format!("{} m", format_with_comma(length_mm / 1000.0))
-            };
-            
+
+            let labels = &self.line_labels[idx];
+
             painter.text(
                 mid,
                 egui::Align2::CENTER_CENTER,
-                formatted,
-                egui::FontId::proportional(20.0),
-                Color32::from_rgb(56, 62, 66),  //Anthrazit
+                labels.length.as_str(),
+                FONT_LINE_LABEL,
+                LINE_LABEL_COLOR,
             );
 
-            painter.circle_filled(start_screen, 4.0, Color32::from_rgb(255, 200, 0));
+            painter.circle_filled(start_screen, 4.0, LINE_ENDPOINT_COLOR);
             painter.text(
                 start_screen + Vec2::new(15.0, -15.0),
                 egui::Align2::LEFT_BOTTOM,
-                format!("{}°", format_angle_with_comma(line.start_angle)),
-                egui::FontId::proportional(16.0),
-                Color32::from_rgb(56, 62, 66),  //Anthrazit
+                labels.start_angle.as_str(),
+                FONT_LINE_ANGLE,
+                LINE_LABEL_COLOR,
             );
 
-            painter.circle_filled(end_screen, 4.0, Color32::from_rgb(255, 200, 0));
+            painter.circle_filled(end_screen, 4.0, LINE_ENDPOINT_COLOR);
             painter.text(
                 end_screen + Vec2::new(15.0, -15.0),
                 egui::Align2::LEFT_BOTTOM,
-                format!("{}°", format_angle_with_comma(line.end_angle)),
-                egui::FontId::proportional(16.0),
-                Color32::from_rgb(56, 62, 66),  //Anthrazit
+                labels.end_angle.as_str(),
+                FONT_LINE_ANGLE,
+                LINE_LABEL_COLOR,
             );
 
             let start_side_idx = line.start_side;
-            let start_vertex = &self.quad.vertices[start_side_idx];
-            let segment_start_length_um = distance_um(start_vertex, &line.start);
-            let segment_start_mm = segment_start_length_um as f64 / 1000.0;
-            let segment_start_formatted = if use_cm {
-                format!("{} cm", format_with_comma(segment_start_mm / 10.0))
-            } else {
-                format!("{} m", format_with_comma(segment_start_mm / 1000.0))
-            };
-            
             let segment_start_screen = Pos2::new(
                 (screen_vertices[start_side_idx].x + start_screen.x) / 2.0,
                 (screen_vertices[start_side_idx].y + start_screen.y) / 2.0,
             );
-            
+
             painter.text(
                 segment_start_screen,
                 egui::Align2::CENTER_CENTER,
-                segment_start_formatted,
-                egui::FontId::proportional(14.0),
-                Color32::from_rgb(150, 150, 150),
+                labels.segment_start.as_str(),
+                FONT_SEGMENT_LABEL,
+                SEGMENT_LABEL_COLOR,
             );
 
-            let end_side_idx = line.end_side;
-            let next_end_idx = (end_side_idx + 1) % 4;
-            let end_vertex = &self.quad.vertices[next_end_idx];
-            let segment_end_length_um = distance_um(&line.end, end_vertex);
-            let segment_end_mm = segment_end_length_um as f64 / 1000.0;
-            let segment_end_formatted = if use_cm {
-                format!("{} cm", format_with_comma(segment_end_mm / 10.0))
-            } else {
-                format!("{} m", format_with_comma(segment_end_mm / 1000.0))
-            };
-            
+            let next_end_idx = (line.end_side + 1) % 4;
             let segment_end_screen = Pos2::new(
                 (end_screen.x + screen_vertices[next_end_idx].x) / 2.0,
                 (end_screen.y + screen_vertices[next_end_idx].y) / 2.0,
             );
-            
+
             painter.text(
                 segment_end_screen,
                 egui::Align2::CENTER_CENTER,
-                segment_end_formatted,
-                egui::FontId::proportional(14.0),
-                Color32::from_rgb(150, 150, 150),
+                labels.segment_end.as_str(),
+                FONT_SEGMENT_LABEL,
+                SEGMENT_LABEL_COLOR,
             );
         }
 
+        self.handle_line_interactions(&response, &painter, &transform, &screen_vertices);
+    }
+
+    /// Verarbeitet Hover, Verschieben und das Zeichnen neuer Messlinien.
+    /// Bewusst vom reinen Zeichnen getrennt: die Zeichenschleifen in
+    /// draw_quadrilateral mutieren keinen Zustand mehr
+    fn handle_line_interactions(
+        &mut self,
+        response: &egui::Response,
+        painter: &egui::Painter,
+        transform: &ViewTransform,
+        screen_vertices: &[Pos2; 4],
+    ) {
         // ========== LINIEN-INTERAKTION: HOVER UND VERSCHIEBEN ==========
         let pointer_pos = response.interact_pointer_pos();
         
         // Hover-Erkennung für Linien-Endpunkte
         if let Some(pos) = pointer_pos {
-            self.hovered_line = None;
-            
             if !self.drawing_line && self.dragging_line_idx.is_none() {
-                // Prüfe zuerst Endpunkte (höhere Priorität als Linien)
-                for (idx, line) in self.custom_lines.iter().enumerate() {
-                    let start_screen = to_screen(&line.start);
-                    let end_screen = to_screen(&line.end);
-                    
-                    // Hover auf Endpunkten (größerer Radius)
-                    if (pos - start_screen).length() < 12.0 || (pos - end_screen).length() < 12.0 {
-                        self.hovered_line = Some(idx);
-                        break;
-                    }
-                    
-                    // Sonst: Hover auf der Linie selbst
-                    let dist = point_to_line_distance(pos, start_screen, end_screen);
-                    if dist < 15.0 {
-                        self.hovered_line = Some(idx);
-                        break;
-                    }
+                // Nur neu suchen, wenn sich der Zeiger seit dem letzten
+                // Frame bewegt hat — sonst bleibt das Ergebnis gleich
+                if self.last_hover_pos != Some(pos) {
+                    self.last_hover_pos = Some(pos);
+                    // Endpunkte haben höhere Priorität als die Linie selbst
+                    self.hovered_endpoint = self.find_endpoint_at(pos);
+                    self.hovered_line = self
+                        .hovered_endpoint
+                        .map(|(idx, _)| idx)
+                        .or_else(|| self.find_line_body_at(pos));
                 }
+            } else {
+                self.hovered_line = None;
+                self.hovered_endpoint = None;
+                self.last_hover_pos = None;
             }
 
             // ========== DRAG START: Endpunkt zum Verschieben auswählen ==========
             if response.drag_started() && !self.drawing_line {
-                for (idx, line) in self.custom_lines.iter().enumerate() {
-                    let start_screen = to_screen(&line.start);
-                    let end_screen = to_screen(&line.end);
-                    
-                    let dist_to_start = (pos - start_screen).length();
-                    let dist_to_end = (pos - end_screen).length();
-                    
-                    // Prüfe ob auf einem Endpunkt geklickt wurde
-                    if dist_to_start < 12.0 || dist_to_end < 12.0 {
-                        self.dragging_line_idx = Some(idx);
-                        // Merke welcher Endpunkt näher ist
-                        self.drag_offset = if dist_to_start < dist_to_end {
-                            Vec2::new(0.0, 0.0) // Start-Punkt wird verschoben
-                        } else {
-                            Vec2::new(1.0, 0.0) // End-Punkt wird verschoben (x=1 als Flag)
-                        };
-                        break;
-                    }
+                // Ergebnis des Hover-Tests wiederverwenden — derselbe
+                // Zeigerpunkt wurde oben bereits gegen alle Linien geprüft
+                if let Some((idx, moving_start)) = self.hovered_endpoint {
+                    self.dragging_line_idx = Some(idx);
+                    // Merke welcher Endpunkt verschoben wird (x=1 als End-Flag)
+                    self.drag_offset = if moving_start {
+                        Vec2::new(0.0, 0.0)
+                    } else {
+                        Vec2::new(1.0, 0.0)
+                    };
                 }
             }
 
@@ -709,91 +894,65 @@ impl CadApp {
             if let Some(drag_idx) = self.dragging_line_idx {
                 if response.dragged() {
                     let moving_start = self.drag_offset.x == 0.0; // true = Start, false = End
-                    
+
                     // Finde beste Position auf einer Seite
-                    let mut best_side = 0;
-                    let mut best_ratio = 0.5;
-                    let mut min_dist = f32::MAX;
-                    
-                    for side_idx in 0..4 {
-                        let next_idx = (side_idx + 1) % 4;
-                        let side_start = screen_vertices[side_idx];
-                        let side_end = screen_vertices[next_idx];
-                        
-                        let ratio = project_point_on_line(pos, side_start, side_end);
-                        let point_on_side = Pos2::new(
-                            side_start.x + (side_end.x - side_start.x) * ratio as f32,
-                            side_start.y + (side_end.y - side_start.y) * ratio as f32,
-                        );
-                        
-                        let dist = (pos - point_on_side).length();
-                        if dist < min_dist {
-                            min_dist = dist;
-                            best_side = side_idx;
-                            best_ratio = ratio;
-                        }
-                    }
-                    
+                    let (best_side, best_ratio) = project_to_nearest_side(pos, screen_vertices);
+
+
                     // Hole die aktuelle Linie
                     let current_line = &self.custom_lines[drag_idx];
-                    
-                    // Berechne neue Punkte (nur EINEN Punkt verschieben!)
-                    let (new_start_point, new_start_side, new_start_ratio, new_end_point, new_end_side, new_end_ratio) = 
-                        if moving_start {
-                            // Verschiebe Start-Punkt, End-Punkt bleibt
-                            (
-                                self.quad.get_point_on_side(best_side, best_ratio),
-                                best_side,
-                                best_ratio,
-                                current_line.end.clone(),
-                                current_line.end_side,
-                                current_line.end_ratio
-                            )
-                        } else {
-                            // Verschiebe End-Punkt, Start-Punkt bleibt
-                            (
-                                current_line.start.clone(),
-                                current_line.start_side,
-                                current_line.start_ratio,
-                                self.quad.get_point_on_side(best_side, best_ratio),
-                                best_side,
-                                best_ratio
-                            )
-                        };
-                    
-                    let length_um = distance_um(&new_start_point, &new_end_point);
-                    
-                    // Berechne neue Schnittwinkel
-                    let start_vertex_idx = new_start_side;
-                    let start_next_idx = (new_start_side + 1) % 4;
-                    let start_angle = calculate_intersection_angle(
-                        &self.quad.vertices[start_vertex_idx],
-                        &self.quad.vertices[start_next_idx],
-                        &new_start_point,
-                        &new_end_point,
-                    );
-                    
-                    let end_vertex_idx = new_end_side;
-                    let end_next_idx = (new_end_side + 1) % 4;
-                    let end_angle = calculate_intersection_angle(
-                        &self.quad.vertices[end_vertex_idx],
-                        &self.quad.vertices[end_next_idx],
-                        &new_end_point,
-                        &new_start_point,
-                    );
-                    
-                    // Aktualisiere die Linie
-                    self.custom_lines[drag_idx] = CustomLine {
-                        start: new_start_point,
-                        end: new_end_point,
-                        length_um,
-                        start_side: new_start_side,
-                        end_side: new_end_side,
-                        start_ratio: new_start_ratio,
-                        end_ratio: new_end_ratio,
-                        start_angle,
-                        end_angle,
+
+                    // Projektion unverändert (z.B. Zeiger hinter dem Seitenende,
+                    // Ratio bleibt geklemmt)? Dann gibt es nichts neu zu berechnen
+                    let (cur_side, cur_ratio) = if moving_start {
+                        (current_line.start_side, current_line.start_ratio)
+                    } else {
+                        (current_line.end_side, current_line.end_ratio)
                     };
+                    let projection_changed = best_side != cur_side || best_ratio != cur_ratio;
+
+                    if projection_changed {
+                        // Nur den bewegten Endpunkt direkt in der Linie
+                        // anpassen — der andere bleibt unverändert, es wird
+                        // keine komplette CustomLine neu aufgebaut
+                        let new_point = self.quad.get_point_on_side(best_side, best_ratio);
+                        {
+                            let line = &mut self.custom_lines[drag_idx];
+                            if moving_start {
+                                line.start = new_point;
+                                line.start_side = best_side;
+                                line.start_ratio = best_ratio;
+                            } else {
+                                line.end = new_point;
+                                line.end_side = best_side;
+                                line.end_ratio = best_ratio;
+                            }
+                            line.length_um = distance_um(&line.start, &line.end);
+                        }
+
+                        // Beide Schnittwinkel hängen von beiden Endpunkten ab
+                        let line = &self.custom_lines[drag_idx];
+                        let start_angle = calculate_intersection_angle(
+                            &self.quad.vertices[line.start_side],
+                            &self.quad.vertices[(line.start_side + 1) % 4],
+                            &line.start,
+                            &line.end,
+                        );
+                        let end_angle = calculate_intersection_angle(
+                            &self.quad.vertices[line.end_side],
+                            &self.quad.vertices[(line.end_side + 1) % 4],
+                            &line.end,
+                            &line.start,
+                        );
+
+                        let line = &mut self.custom_lines[drag_idx];
+                        line.start_angle = start_angle;
+                        line.end_angle = end_angle;
+
+                        // Gecachte Beschriftung nachziehen
+                        let snapshot = self.custom_lines[drag_idx].clone();
+                        self.line_labels[drag_idx] = self.make_line_labels(&snapshot);
+                    }
                 }
             }
 
@@ -806,9 +965,9 @@ impl CadApp {
                 if response.drag_started() && !self.drawing_line {
                     for i in 0..4 {
                         let next = (i + 1) % 4;
-                        let dist = point_to_line_distance(pos, screen_vertices[i], screen_vertices[next]);
-                        
-                        if dist < 10.0 {
+                        let dist_sq = point_to_line_distance_sq(pos, screen_vertices[i], screen_vertices[next]);
+
+                        if dist_sq < 10.0 * 10.0 {
                             let ratio = project_point_on_line(pos, screen_vertices[i], screen_vertices[next]);
                             self.line_start = Some((i, ratio, pos));
                             self.drawing_line = true;
@@ -822,11 +981,11 @@ impl CadApp {
                     
                     if let Some((start_side, start_ratio, _)) = self.line_start {
                         let start_point = self.quad.get_point_on_side(start_side, start_ratio);
-                        let start_screen = to_screen(&start_point);
+                        let start_screen = transform.to_screen(&start_point);
                         
                         painter.line_segment(
                             [start_screen, pos],
-                            Stroke::new(3.0, Color32::from_rgba_unmultiplied(200, 100, 0, 128)),
+                            Stroke::new(3.0, PREVIEW_LINE_COLOR),
                         );
                     }
                 }
@@ -835,9 +994,9 @@ impl CadApp {
                     if let Some((start_side, start_ratio, _)) = self.line_start {
                         for i in 0..4 {
                             let next = (i + 1) % 4;
-                            let dist = point_to_line_distance(pos, screen_vertices[i], screen_vertices[next]);
-                            
-                            if dist < 10.0 {
+                            let dist_sq = point_to_line_distance_sq(pos, screen_vertices[i], screen_vertices[next]);
+
+                            if dist_sq < 10.0 * 10.0 {
                                 let end_ratio = project_point_on_line(pos, screen_vertices[i], screen_vertices[next]);
                                 
                                 let start_point = self.quad.get_point_on_side(start_side, start_ratio);
@@ -862,7 +1021,7 @@ impl CadApp {
                                     &start_point,
                                 );
                                 
-                                self.custom_lines.push(CustomLine {
+                                let new_line = CustomLine {
                                     start: start_point,
                                     end: end_point,
                                     length_um,
@@ -872,7 +1031,9 @@ impl CadApp {
                                     end_ratio,
                                     start_angle,
                                     end_angle,
-                                });
+                                };
+                                self.line_labels.push(self.make_line_labels(&new_line));
+                                self.custom_lines.push(new_line);
                                 break;
                             }
                         }
@@ -886,43 +1047,55 @@ impl CadApp {
         }
     }
 
-    fn take_screenshot(&self) {
-        if let Ok(screens) = screenshots::Screen::all() {
-            if let Some(screen) = screens.first() {
-                if let Ok(image) = screen.capture() {
-                    let desktop = dirs::desktop_dir().unwrap_or_else(|| PathBuf::from("."));
-                    let filename = desktop.join(format!("cad_screenshot_{}.png", 
-                        chrono::Local::now().format("%Y%m%d_%H%M%S")));
-                    
-                    let _ = image.save(&filename);
-                }
-            }
-        }
+    fn take_screenshot(&self, ctx: &egui::Context) {
+        // Capture und PNG-Kompression sind blockierend und dauern bei
+        // großen Bildschirmen spürbar — daher komplett im Worker-Thread;
+        // das Ergebnis meldet der Worker über den geteilten Status zurück
+        let status = self.screenshot_status.clone();
+        let ctx = ctx.clone();
+        *status.lock().unwrap() = Some("📸 Screenshot wird gespeichert...".to_string());
+
+        std::thread::spawn(move || {
+            let result = (|| -> Option<PathBuf> {
+                let screens = screenshots::Screen::all().ok()?;
+                let screen = screens.first()?;
+                let image = screen.capture().ok()?;
+                let desktop = dirs::desktop_dir().unwrap_or_else(|| PathBuf::from("."));
+                let filename = desktop.join(format!("cad_screenshot_{}.png",
+                    chrono::Local::now().format("%Y%m%d_%H%M%S")));
+                image.save(&filename).ok()?;
+                Some(filename)
+            })();
+
+            *status.lock().unwrap() = Some(match result {
+                Some(path) => format!("✅ Screenshot gespeichert: {}", path.display()),
+                None => "❌ Screenshot fehlgeschlagen".to_string(),
+            });
+            ctx.request_repaint();
+        });
     }
 
-    fn check_for_updates(&mut self) {
+    fn check_for_updates(&mut self, ctx: &egui::Context) {
         self.checking_update = true;
+        *self.update_info.lock().unwrap() = None;
         let update_info = self.update_info.clone();
-        
+        let ctx = ctx.clone();
+
+        // Die Netzwerkabfrage läuft komplett im Worker; der UI-Thread
+        // blockiert nicht mehr und der Dialog öffnet erst mit Ergebnis
         tokio::spawn(async move {
-            match updater::check_for_updates().await {
-                Ok(info) => {
-                    *update_info.lock().unwrap() = Some(info);
-                }
-                Err(_) => {
-                    *update_info.lock().unwrap() = Some(UpdateInfo {
-                        available: false,
-                        current_version: env!("CARGO_PKG_VERSION").to_string(),
-                        latest_version: env!("CARGO_PKG_VERSION").to_string(),
-                        download_url: None,
-                    });
-                }
-            }
+            let info = match updater::check_for_updates().await {
+                Ok(info) => info,
+                Err(_) => UpdateInfo {
+                    available: false,
+                    current_version: env!("CARGO_PKG_VERSION").to_string(),
+                    latest_version: env!("CARGO_PKG_VERSION").to_string(),
+                    download_url: None,
+                },
+            };
+            *update_info.lock().unwrap() = Some(info);
+            ctx.request_repaint();
         });
-        
-        std::thread::sleep(std::time::Duration::from_millis(100));
-        self.checking_update = false;
-        self.show_update_dialog = true;
     }
 
     fn install_update(&mut self) {
@@ -946,21 +1119,54 @@ impl CadApp {
     }
 }
 
-fn point_to_line_distance(p: Pos2, line_start: Pos2, line_end: Pos2) -> f32 {
+#[inline]
+/// Projiziert einen Bildschirmpunkt auf alle vier Seiten des Vierecks
+/// und liefert (Seitenindex, geklemmte Ratio) der nächstgelegenen —
+/// der Vergleich läuft über quadrierte Distanzen
+fn project_to_nearest_side(pos: Pos2, screen_vertices: &[Pos2; 4]) -> (usize, f64) {
+    let mut best_side = 0;
+    let mut best_ratio = 0.5;
+    let mut min_dist_sq = f32::MAX;
+
+    for side_idx in 0..4 {
+        let side_start = screen_vertices[side_idx];
+        let side_end = screen_vertices[(side_idx + 1) % 4];
+
+        let ratio = project_point_on_line(pos, side_start, side_end);
+        let point_on_side = Pos2::new(
+            side_start.x + (side_end.x - side_start.x) * ratio as f32,
+            side_start.y + (side_end.y - side_start.y) * ratio as f32,
+        );
+
+        let dist_sq = (pos - point_on_side).length_sq();
+        if dist_sq < min_dist_sq {
+            min_dist_sq = dist_sq;
+            best_side = side_idx;
+            best_ratio = ratio;
+        }
+    }
+
+    (best_side, best_ratio)
+}
+
+/// Quadrierte Distanz Punkt–Strecke; die Aufrufer vergleichen nur gegen
+/// Schwellwerte, daher kann die Wurzel komplett entfallen
+fn point_to_line_distance_sq(p: Pos2, line_start: Pos2, line_end: Pos2) -> f32 {
     let line_vec = line_end - line_start;
     let point_vec = p - line_start;
-    
+
     let line_len_sq = line_vec.x * line_vec.x + line_vec.y * line_vec.y;
     if line_len_sq == 0.0 {
-        return point_vec.length();
+        return point_vec.length_sq();
     }
-    
+
     let t = ((point_vec.x * line_vec.x + point_vec.y * line_vec.y) / line_len_sq).clamp(0.0, 1.0);
     let projection = line_start + t * line_vec;
-    
-    (p - projection).length()
+
+    (p - projection).length_sq()
 }
 
+#[inline]
 fn project_point_on_line(p: Pos2, line_start: Pos2, line_end: Pos2) -> f64 {
     let line_vec = line_end - line_start;
     let point_vec = p - line_start;